@@ -18,4 +18,4 @@ done
 echo "All services are up!"
 
 # Run the FastAPI application
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+exec uvicorn api.main:app --host 0.0.0.0 --port 8000 --reload
@@ -5,12 +5,15 @@ Generate realistic data for MirTech API
 import random
 import faker
 import datetime
-from typing import List
+import multiprocessing
+import os
+from itertools import chain
+from typing import List, NamedTuple
 import uuid
-from models import UserSchema, ProductSchema, OrderSchema, OrderItemSchema, TransactionSchema
-from models import User, Product, Order, OrderItem, Transaction, Base, FactSales
-from database import engine, SessionLocal
-from decimal import Decimal
+import numpy as np
+from sqlalchemy import text
+from api.models import Base
+from api.database import get_engine
 import faker_commerce
 
 EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com", "proton.me"]
@@ -18,207 +21,487 @@ ORDER_STATUSES = ["pending", "processing", "shipped", "delivered", "cancelled",
 PAYMENT_METHODS = {"credit_card": 33, "debit_card":40, "paypal":21, "bank_transfer":10, "apple_pay":10, "google_pay":20, "crypto":5}
 TRANSACTION_STATUSES = {"pending": 20, "completed":50, "failed":20, "refunded":10}
 
-def generate_user(n: int = 10000) -> List[UserSchema]:
+SEED_TABLES = ("users", "products", "orders", "order_items", "transactions", "fact_sales")
+
+# Column order for the COPY loads below; must match the tuples built in
+# seed_database
+USER_COLUMNS = ("user_id", "name", "email", "phone", "address", "created_at")
+PRODUCT_COLUMNS = ("product_id", "name", "category", "price", "stock", "rating")
+ORDER_COLUMNS = ("order_id", "user_id", "total_amount", "status", "created_at")
+ORDER_ITEM_COLUMNS = ("order_item_id", "order_id", "product_id", "quantity", "unit_price")
+TRANSACTION_COLUMNS = ("transaction_id", "order_id", "amount", "payment_method", "status", "timestamp")
+# Lightweight intermediate rows: the generators only feed COPY, so plain
+# NamedTuples beat Pydantic models (no validation, no per-instance dict)
+# while keeping the same attribute access downstream
+class UserRow(NamedTuple):
+    user_id: uuid.UUID
+    name: str
+    email: str
+    phone: str
+    address: str
+    created_at: datetime.datetime
+
+
+class ProductRow(NamedTuple):
+    product_id: uuid.UUID
+    name: str
+    category: str
+    price: float
+    stock: int
+    rating: float
+
+
+class OrderRow(NamedTuple):
+    order_id: uuid.UUID
+    user_id: uuid.UUID
+    total_amount: float
+    status: str
+    created_at: datetime.datetime
+
+
+class OrderItemRow(NamedTuple):
+    order_item_id: uuid.UUID
+    order_id: uuid.UUID
+    product_id: uuid.UUID
+    quantity: int
+    unit_price: float
+
+
+class TransactionRow(NamedTuple):
+    transaction_id: uuid.UUID
+    order_id: uuid.UUID
+    amount: float
+    payment_method: str
+    status: str
+    timestamp: datetime.datetime
+
+
+FACT_SALES_COLUMNS = (
+    "fact_id",
+    "user_id", "user_name", "user_email", "user_phone", "user_address", "user_created_at",
+    "product_id", "product_name", "product_category", "product_price", "product_stock", "product_rating",
+    "order_id", "order_total_amount", "order_status", "order_created_at",
+    "order_item_id", "order_item_quantity", "order_item_unit_price",
+    "transaction_id", "transaction_amount", "transaction_payment_method", "transaction_status", "transaction_timestamp",
+)
+
+
+def _copy_rows(raw_conn, table: str, columns, rows) -> int:
+    """Bulk-load rows into a table with COPY FROM STDIN.
+
+    One streamed statement replaces thousands of parameterized INSERTs;
+    psycopg adapts UUID/float/datetime values natively via write_row;
+    floats land in NUMERIC columns as text the server coerces itself.
+    Returns the number of rows written.
+    """
+    count = 0
+    with raw_conn.cursor() as cur:
+        with cur.copy(f'COPY {table} ({", ".join(columns)}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+
+def _iter_fact_rows(order_items, user_map, product_map, order_map, transaction_map):
+    """Yield fact_sales rows (in FACT_SALES_COLUMNS order) one at a time.
+
+    The maps hold pre-extracted column tuples keyed by join ID, so each
+    row is four dict probes plus tuple concatenation; streaming the rows
+    into COPY keeps peak memory at one row instead of the whole table.
+    """
+    fact_ids = iter(_uuids(len(order_items)))
+
+    for order_item in order_items:
+        order = order_map.get(order_item.order_id)
+        if not order:
+            continue
+
+        user = user_map.get(order[0])
+        product = product_map.get(order_item.product_id)
+        transaction = transaction_map.get(order_item.order_id)
+
+        if not (user and product and transaction):
+            continue
+
+        # Concatenation order: fact_id, user, product, order, item, transaction
+        yield (
+            (next(fact_ids),)
+            + user
+            + product
+            + (order_item.order_id, order[1], order[2], order[3])
+            + (order_item.order_item_id, order_item.quantity, order_item.unit_price)
+            + transaction
+        )
+
+
+def _defer_indexes(raw_conn, tables) -> List[str]:
+    """Drop the secondary indexes on tables and return their CREATE DDL.
+
+    Rebuilding each index once after the load is one O(n log n) sort per
+    index instead of a btree insert per row during COPY. Indexes backing
+    primary-key and unique constraints stay, since dropping those means
+    dropping the constraint.
+    """
+    with raw_conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE schemaname = 'public' AND tablename = ANY(%s)
+              AND indexname NOT IN (
+                  SELECT conname FROM pg_constraint WHERE contype IN ('p', 'u')
+              )
+            """,
+            (list(tables),),
+        )
+        indexes = cur.fetchall()
+        for name, _ in indexes:
+            cur.execute(f'DROP INDEX {name}')
+    return [indexdef for _, indexdef in indexes]
+
+
+# Generation is pure-Python and Faker-heavy, so it is GIL-bound; each
+# generate_* shards its row count across a process pool. Workers get an
+# explicit seed so chunks don't repeat each other's draws, and jobs below
+# the threshold stay in-process to skip the fork/pickle overhead.
+_POOL_MIN_ROWS = 5000
+
+
+def _uuids(n: int) -> List[uuid.UUID]:
+    """n random UUIDs from a single os.urandom call.
+
+    uuid.uuid4() pays a syscall per ID; drawing all the entropy at once
+    amortizes that to one. version=4 keeps the results well-formed v4.
+    """
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+def _split_counts(n: int, parts: int) -> List[int]:
+    """Split n rows into parts near-equal chunk sizes"""
+    base, rem = divmod(n, parts)
+    return [base + (1 if i < rem else 0) for i in range(parts)]
+
+
+def _parallel_chunks(worker, n: int, extras=()):
+    """Run worker((chunk_n, seed, *extras)) across a process pool.
+
+    extras are chunk-independent arguments (parent ID lists etc.) pickled
+    once per worker; results are concatenated in worker order.
+    """
+    workers = os.cpu_count() or 1
+    if workers == 1 or n < _POOL_MIN_ROWS:
+        return worker((n, random.randrange(2**32), *extras))
+    args = [
+        (size, random.randrange(2**32), *extras)
+        for size in _split_counts(n, workers) if size
+    ]
+    with multiprocessing.Pool(len(args)) as pool:
+        return list(chain.from_iterable(pool.map(worker, args)))
+
+
+def _generate_user_chunk(args) -> List[UserRow]:
+    n, seed = args
+    rng = random.Random(seed)
     fake = faker.Faker()
+    fake.seed_instance(seed)
     users = []
     address_by_lastname = {}  # Cache addresses by last name
-    
-    for _ in range(n):
+
+    # Numeric columns come from vectorized draws; the loop just indexes them
+    nprng = np.random.default_rng(seed)
+    email_suffixes = nprng.integers(1, 10000, n)
+    ids = _uuids(n)
+    # Categorical columns pre-sampled in one call each
+    domains = rng.choices(EMAIL_DOMAINS, k=n)
+    # One clock read for the whole chunk
+    now = datetime.datetime.now()
+
+    for i in range(n):
         first_name = fake.first_name()
         last_name = fake.last_name()
-        
+
         user_name = f"{first_name} {last_name}"
-        
+
         # Generate unique email using first and last name with random domain
-        email = f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 9999)}@{random.choice(EMAIL_DOMAINS)}"
-        
+        email = f"{first_name.lower()}.{last_name.lower()}{email_suffixes[i]}@{domains[i]}"
+
         # Generate unique phone
         phone = fake.phone_number()
-        
+
         # Reuse address if last name already exists, otherwise create new one
         if last_name in address_by_lastname:
             address = address_by_lastname[last_name]
         else:
             address = fake.address()
             address_by_lastname[last_name] = address
-        
-        user = UserSchema(
-            user_id=uuid.uuid4(),
+
+        user = UserRow(
+            user_id=ids[i],
             name=user_name,
             email=email,
             phone=phone,
             address=address,
-            created_at=datetime.datetime.now()
+            created_at=now
         )
-        
+
         users.append(user)
-    
+
     return users
 
 
-def generate_product(n: int = 20000) -> List[ProductSchema]:
+def generate_user(n: int = 10000) -> List[UserRow]:
+    return _parallel_chunks(_generate_user_chunk, n)
+
+
+def _generate_product_chunk(args) -> List[ProductRow]:
+    n, seed = args
     fake = faker.Faker()
+    fake.seed_instance(seed)
 
     products = []
     fake.add_provider(faker_commerce.Provider)
-    
-    generated_names = set()  # Track unique product names
-    
-    for _ in range(n):
-        # Generate unique product name
-        attempts = 0
-        while attempts < 100:  # Prevent infinite loop
-            name = fake.ecommerce_name()
-            if name not in generated_names:
-                generated_names.add(name)
-                break
-            attempts += 1
-        else:
-            # If we can't find unique name, append a unique identifier
-            name = f"{fake.ecommerce_name()} - {uuid.uuid4().hex[:8]}"
-            generated_names.add(name)
 
-        product = ProductSchema(
-            product_id=uuid.uuid4(),
+    name_counts = {}  # Occurrences per raw name, for dedup suffixes
+
+    # Vectorized numeric columns, indexed per row below
+    nprng = np.random.default_rng(seed)
+    prices = np.round(nprng.uniform(5, 50000, n), 2)
+    stocks = nprng.integers(8, 10001, n)
+    ratings = np.round(nprng.uniform(1, 5, n), 2)
+    ids = _uuids(n)
+
+    for i in range(n):
+        # One draw per product: repeats get a running suffix instead of
+        # rejection-sampling new names as the collision rate climbs
+        name = fake.ecommerce_name()
+        count = name_counts.get(name, 0) + 1
+        name_counts[name] = count
+        if count > 1:
+            name = f"{name} #{count}"
+
+        product = ProductRow(
+            product_id=ids[i],
             name=name,
             category = fake.ecommerce_category(),
-            price = round(random.uniform(5, 50000), 2),
-            stock = random.randint(8,10000),
-            rating = round(random.uniform(1, 5), 2)
+            price = float(prices[i]),
+            stock = int(stocks[i]),
+            rating = float(ratings[i])
         )
         products.append(product)
     return products
 
 
-def generate_order(n: int = 15000, users: List[UserSchema] = None) -> List[OrderSchema]:
-    """
-    Generate n orders. If users list is provided, orders will reference those user IDs.
-    """
-    fake = faker.Faker()
+def generate_product(n: int = 20000) -> List[ProductRow]:
+    return _parallel_chunks(_generate_product_chunk, n)
+
+
+def _generate_order_chunk(args) -> List[OrderRow]:
+    n, seed, user_ids = args
+    rng = random.Random(seed)
     orders = []
-    
-    for _ in range(n):
+
+    # Vectorized numeric columns, indexed per row below
+    nprng = np.random.default_rng(seed)
+    total_amounts = np.round(nprng.uniform(10, 10000, n), 2)
+    # Dates within the last year, computed as one vectorized subtraction
+    # from a single clock read; tolist() yields datetime objects
+    now = np.datetime64(datetime.datetime.now(), 'us')
+    created_ats = (now - nprng.integers(0, 366, n).astype('timedelta64[D]')).tolist()
+    ids = _uuids(n)
+    # Categorical columns pre-sampled in one call each
+    statuses = rng.choices(ORDER_STATUSES, k=n)
+    # Parent IDs picked via one bulk index draw instead of a choice() per row
+    user_picks = nprng.integers(0, len(user_ids), n) if user_ids else None
+
+    for i in range(n):
         # Use provided user_id or generate random one
-        user_id = random.choice(users).user_id if users else uuid.uuid4()
-        
-        # Generate order date within the last year
-        days_ago = random.randint(0, 365)
-        created_at = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-        
-        order = OrderSchema(
-            order_id=uuid.uuid4(),
+        user_id = user_ids[user_picks[i]] if user_ids else uuid.uuid4()
+
+        order = OrderRow(
+            order_id=ids[i],
             user_id=user_id,
-            total_amount=Decimal(str(round(random.uniform(10, 10000), 2))),
-            status=random.choice(ORDER_STATUSES),
-            created_at=created_at
+            total_amount=float(total_amounts[i]),
+            status=statuses[i],
+            created_at=created_ats[i]
         )
         orders.append(order)
-    
+
     return orders
 
 
-def generate_order_item(n: int = 45000, orders: List[OrderSchema] = None, products: List[ProductSchema] = None) -> List[OrderItemSchema]:
+def generate_order(n: int = 15000, users: List[UserRow] = None) -> List[OrderRow]:
     """
-    Generate n order items. If orders and products lists are provided, 
-    items will reference those order and product IDs.
+    Generate n orders. If users list is provided, orders will reference those user IDs.
     """
+    # Ship only the IDs to the workers, not whole user records
+    user_ids = [u.user_id for u in users] if users else None
+    return _parallel_chunks(_generate_order_chunk, n, (user_ids,))
+
+
+def _generate_order_item_chunk(args) -> List[OrderItemRow]:
+    n, seed, order_ids, product_ids = args
+    rng = random.Random(seed)
     order_items = []
-    
-    for _ in range(n):
+
+    # Vectorized numeric columns, indexed per row below
+    nprng = np.random.default_rng(seed)
+    quantities = nprng.integers(1, 11, n)
+    unit_prices = np.round(nprng.uniform(5, 5000, n), 2)
+    ids = _uuids(n)
+    # Parent IDs picked via one bulk index draw instead of a choice() per row
+    order_picks = nprng.integers(0, len(order_ids), n) if order_ids else None
+    product_picks = nprng.integers(0, len(product_ids), n) if product_ids else None
+
+    for i in range(n):
         # Use provided IDs or generate random ones
-        order_id = random.choice(orders).order_id if orders else uuid.uuid4()
-        product_id = random.choice(products).product_id if products else uuid.uuid4()
-        
-        quantity = random.randint(1, 10)
-        unit_price = Decimal(str(round(random.uniform(5, 5000), 2)))
-        
-        order_item = OrderItemSchema(
-            order_item_id=uuid.uuid4(),
+        order_id = order_ids[order_picks[i]] if order_ids else uuid.uuid4()
+        product_id = product_ids[product_picks[i]] if product_ids else uuid.uuid4()
+
+        order_item = OrderItemRow(
+            order_item_id=ids[i],
             order_id=order_id,
             product_id=product_id,
-            quantity=quantity,
-            unit_price=unit_price
+            quantity=int(quantities[i]),
+            unit_price=float(unit_prices[i])
         )
         order_items.append(order_item)
-    
+
     return order_items
 
 
-def generate_transaction(n: int = 15000, orders: List[OrderSchema] = None) -> List[TransactionSchema]:
+def generate_order_item(n: int = 45000, orders: List[OrderRow] = None, products: List[ProductRow] = None) -> List[OrderItemRow]:
     """
-    Generate n transactions. If orders list is provided, transactions will reference those order IDs.
-    Each transaction is linked to one order.
+    Generate n order items. If orders and products lists are provided,
+    items will reference those order and product IDs.
     """
+    order_ids = [o.order_id for o in orders] if orders else None
+    product_ids = [p.product_id for p in products] if products else None
+    return _parallel_chunks(_generate_order_item_chunk, n, (order_ids, product_ids))
+
+
+def _generate_transaction_chunk(args) -> List[TransactionRow]:
+    n, seed, order_pool = args
+    rng = random.Random(seed)
     transactions = []
-    
-    # If orders provided, create one transaction per order (up to n)
-    order_ids_used = set()
-    
-    for _ in range(n):
-        if orders:
-            # Find an order that hasn't been used yet
-            available_orders = [o for o in orders if o.order_id not in order_ids_used]
-            if available_orders:
-                selected_order = random.choice(available_orders)
-                order_id = selected_order.order_id
-                order_ids_used.add(order_id)
-                amount = selected_order.total_amount
-            else:
-                # All orders used, generate random order_id
-                order_id = uuid.uuid4()
-                amount = Decimal(str(round(random.uniform(10, 10000), 2)))
+
+    # The pool arrives pre-shuffled and sized to cover the chunk, so
+    # consuming it front to back is an unbiased unique draw. Refuse to run
+    # short rather than fabricate order IDs: the seed load runs with FK
+    # triggers off, so a made-up reference would commit silently as a
+    # dangling row instead of failing.
+    if order_pool is not None and len(order_pool) < n:
+        raise ValueError(
+            f"order pool holds {len(order_pool)} orders for {n} transactions"
+        )
+
+    # Vectorized numeric columns, indexed per row below
+    nprng = np.random.default_rng(seed)
+    # Amounts are only drawn for pool-less standalone generation; pooled
+    # transactions reuse their order's total
+    fallback_amounts = (
+        np.round(nprng.uniform(10, 10000, n), 2) if order_pool is None else None
+    )
+    # Timestamps within the last year, one clock read per chunk
+    now = np.datetime64(datetime.datetime.now(), 'us')
+    timestamps = (now - nprng.integers(0, 366, n).astype('timedelta64[D]')).tolist()
+    ids = _uuids(n)
+    # Weighted categorical columns pre-sampled in one call each; the
+    # key/weight lists were previously rebuilt on every row
+    payment_methods = rng.choices(
+        list(PAYMENT_METHODS), weights=list(PAYMENT_METHODS.values()), k=n)
+    statuses = rng.choices(
+        list(TRANSACTION_STATUSES), weights=list(TRANSACTION_STATUSES.values()), k=n)
+
+    for i in range(n):
+        if order_pool is not None:
+            order_id, amount = order_pool[i]
         else:
             order_id = uuid.uuid4()
-            amount = Decimal(str(round(random.uniform(10, 10000), 2)))
-        
-        # Generate timestamp within last year
-        days_ago = random.randint(0, 365)
-        timestamp = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-        
-        transaction = TransactionSchema(
-            transaction_id=uuid.uuid4(),
+            amount = float(fallback_amounts[i])
+
+        transaction = TransactionRow(
+            transaction_id=ids[i],
             order_id=order_id,
             amount=amount,
-            payment_method=random.choices(list(PAYMENT_METHODS.keys()), 
-                                  weights=list(PAYMENT_METHODS.values()), 
-                                  k=1)[0],
-            status=random.choices(list(TRANSACTION_STATUSES.keys()), 
-                                  weights=list(TRANSACTION_STATUSES.values()), 
-                                  k=1)[0],
-            timestamp=timestamp
+            payment_method=payment_methods[i],
+            status=statuses[i],
+            timestamp=timestamps[i]
         )
         transactions.append(transaction)
-    
+
     return transactions
 
 
+def generate_transaction(n: int = 15000, orders: List[OrderRow] = None) -> List[TransactionRow]:
+    """
+    Generate n transactions. If orders list is provided, transactions will reference those order IDs.
+    Each transaction is linked to one distinct order, so n must not exceed len(orders).
+    """
+    if not orders:
+        return _parallel_chunks(_generate_transaction_chunk, n, (None,))
+
+    if n > len(orders):
+        raise ValueError(
+            f"cannot generate {n} transactions from {len(orders)} orders: "
+            "each transaction must reference a distinct existing order"
+        )
+
+    # Shuffle once, then hand each worker a disjoint slice of the pool so
+    # no two chunks can link a transaction to the same order
+    order_pool = [(o.order_id, o.total_amount) for o in orders]
+    random.shuffle(order_pool)
+
+    workers = os.cpu_count() or 1
+    if workers == 1 or n < _POOL_MIN_ROWS:
+        return _generate_transaction_chunk((n, random.randrange(2**32), order_pool))
+
+    counts = [size for size in _split_counts(n, workers) if size]
+    pool_sizes = _split_counts(len(order_pool), len(counts))
+    args = []
+    start = 0
+    for size, pool_size in zip(counts, pool_sizes):
+        args.append((size, random.randrange(2**32), order_pool[start:start + pool_size]))
+        start += pool_size
+    with multiprocessing.Pool(len(args)) as pool:
+        return list(chain.from_iterable(pool.map(_generate_transaction_chunk, args)))
+
+
 def seed_database(
     n_users: int = 25000,
     n_products: int = 50000,
     n_orders: int = 37500,
     n_order_items: int = 112500,
     n_transactions: int = 37500,
-    batch_size: int = 1000
 ) -> dict:
     """
     Generate mock data and store it in the PostgreSQL database.
-    
+
+    Each table streams through a single COPY; there is no insert batching
+    to tune since COPY keeps scaling with batch size anyway.
+
     Args:
         n_users: Number of users to generate
         n_products: Number of products to generate
         n_orders: Number of orders to generate
         n_order_items: Number of order items to generate
         n_transactions: Number of transactions to generate
-        batch_size: Number of records to insert per batch (for performance)
-    
+
     Returns:
         Dictionary with counts of inserted records
     """
-    # Create tables if they don't exist
+    # Create tables if they don't exist; pg_trgm must exist first or
+    # create_all fails on the gin_trgm_ops indexes when seeding a fresh
+    # database before the API has ever started
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(bind=engine)
-    
-    session = SessionLocal()
-    
+
+    # COPY goes through the raw DBAPI connection; SQLAlchemy is only needed
+    # for create_all above
+    raw = engine.raw_connection()
+
     try:
         # Generate all mock data
         print("Generating mock data...")
@@ -239,185 +522,139 @@ def seed_database(
         transactions_schema = generate_transaction(n=n_transactions, orders=orders_schema)
         
         print("\nInserting data into database...")
-        
+
+        # Defer index maintenance to a single rebuild after the load, and
+        # skip FK trigger checks during it - referential integrity holds by
+        # construction. Everything below runs inside the load transaction,
+        # so a failure rolls back the drops together with the data.
+        print("  Deferring index maintenance...")
+        index_defs = _defer_indexes(raw, SEED_TABLES)
+        with raw.cursor() as cur:
+            cur.execute("SET session_replication_role = replica")
+            # Don't wait on WAL flush for the seed commit; a crash only
+            # costs us a re-run. LOCAL scopes it to this transaction so
+            # the pooled connection goes back with durable commits intact.
+            cur.execute("SET LOCAL synchronous_commit = off")
+
         # Insert Users
         print(f"  Inserting users...")
-        users_db = [
-            User(
-                user_id=u.user_id,
-                name=u.name,
-                email=u.email,
-                phone=u.phone,
-                address=u.address,
-                created_at=u.created_at
-            ) for u in users_schema
-        ]
-        for i in range(0, len(users_db), batch_size):
-            session.bulk_save_objects(users_db[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(users_db)} users")
-        
+        n_users_inserted = _copy_rows(raw, "users", USER_COLUMNS, (
+            (u.user_id, u.name, u.email, u.phone, u.address, u.created_at)
+            for u in users_schema
+        ))
+        print(f"    ✓ Inserted {n_users_inserted} users")
+
         # Insert Products
         print(f"  Inserting products...")
-        products_db = [
-            Product(
-                product_id=p.product_id,
-                name=p.name,
-                category=p.category,
-                price=p.price,
-                stock=p.stock,
-                rating=p.rating
-            ) for p in products_schema
-        ]
-        for i in range(0, len(products_db), batch_size):
-            session.bulk_save_objects(products_db[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(products_db)} products")
-        
+        n_products_inserted = _copy_rows(raw, "products", PRODUCT_COLUMNS, (
+            (p.product_id, p.name, p.category, p.price, p.stock, p.rating)
+            for p in products_schema
+        ))
+        print(f"    ✓ Inserted {n_products_inserted} products")
+
         # Insert Orders
         print(f"  Inserting orders...")
-        orders_db = [
-            Order(
-                order_id=o.order_id,
-                user_id=o.user_id,
-                total_amount=o.total_amount,
-                status=o.status,
-                created_at=o.created_at
-            ) for o in orders_schema
-        ]
-        for i in range(0, len(orders_db), batch_size):
-            session.bulk_save_objects(orders_db[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(orders_db)} orders")
-        
+        n_orders_inserted = _copy_rows(raw, "orders", ORDER_COLUMNS, (
+            (o.order_id, o.user_id, o.total_amount, o.status, o.created_at)
+            for o in orders_schema
+        ))
+        print(f"    ✓ Inserted {n_orders_inserted} orders")
+
         # Insert Order Items
         print(f"  Inserting order items...")
-        order_items_db = [
-            OrderItem(
-                order_item_id=oi.order_item_id,
-                order_id=oi.order_id,
-                product_id=oi.product_id,
-                quantity=oi.quantity,
-                unit_price=oi.unit_price
-            ) for oi in order_items_schema
-        ]
-        for i in range(0, len(order_items_db), batch_size):
-            session.bulk_save_objects(order_items_db[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(order_items_db)} order items")
-        
+        n_order_items_inserted = _copy_rows(raw, "order_items", ORDER_ITEM_COLUMNS, (
+            (oi.order_item_id, oi.order_id, oi.product_id, oi.quantity, oi.unit_price)
+            for oi in order_items_schema
+        ))
+        print(f"    ✓ Inserted {n_order_items_inserted} order items")
+
         # Insert Transactions
         print(f"  Inserting transactions...")
-        transactions_db = [
-            Transaction(
-                transaction_id=t.transaction_id,
-                order_id=t.order_id,
-                amount=t.amount,
-                payment_method=t.payment_method,
-                status=t.status,
-                timestamp=t.timestamp
-            ) for t in transactions_schema
-        ]
-        for i in range(0, len(transactions_db), batch_size):
-            session.bulk_save_objects(transactions_db[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(transactions_db)} transactions")
+        n_transactions_inserted = _copy_rows(raw, "transactions", TRANSACTION_COLUMNS, (
+            (t.transaction_id, t.order_id, t.amount, t.payment_method, t.status, t.timestamp)
+            for t in transactions_schema
+        ))
+        print(f"    ✓ Inserted {n_transactions_inserted} transactions")
         
         # Populate Fact Sales Table
         print(f"\n  Populating fact_sales table...")
         print(f"    Joining data from all tables...")
         
-        # Create a mapping for quick lookups
-        user_map = {u.user_id: u for u in users_schema}
-        product_map = {p.product_id: p for p in products_schema}
-        order_map = {o.order_id: o for o in orders_schema}
-        transaction_map = {t.order_id: t for t in transactions_schema}
-        
-        fact_sales_records = []
-        
-        for order_item in order_items_schema:
-            order = order_map.get(order_item.order_id)
-            if not order:
-                continue
-                
-            user = user_map.get(order.user_id)
-            product = product_map.get(order_item.product_id)
-            transaction = transaction_map.get(order_item.order_id)
-            
-            if not (user and product and transaction):
-                continue
-            
-            fact_record = FactSales(
-                fact_id=uuid.uuid4(),
-                # User dimension
-                user_id=user.user_id,
-                user_name=user.name,
-                user_email=user.email,
-                user_phone=user.phone,
-                user_address=user.address,
-                user_created_at=user.created_at,
-                # Product dimension
-                product_id=product.product_id,
-                product_name=product.name,
-                product_category=product.category,
-                product_price=product.price,
-                product_stock=product.stock,
-                product_rating=product.rating,
-                # Order dimension
-                order_id=order.order_id,
-                order_total_amount=order.total_amount,
-                order_status=order.status,
-                order_created_at=order.created_at,
-                # Order Item dimension
-                order_item_id=order_item.order_item_id,
-                order_item_quantity=order_item.quantity,
-                order_item_unit_price=order_item.unit_price,
-                # Transaction dimension
-                transaction_id=transaction.transaction_id,
-                transaction_amount=transaction.amount,
-                transaction_payment_method=transaction.payment_method,
-                transaction_status=transaction.status,
-                transaction_timestamp=transaction.timestamp
-            )
-            fact_sales_records.append(fact_record)
-        
-        # Insert fact sales in batches
-        for i in range(0, len(fact_sales_records), batch_size):
-            session.bulk_save_objects(fact_sales_records[i:i + batch_size])
-            session.commit()
-        print(f"    ✓ Inserted {len(fact_sales_records):,} fact_sales records")
-        
-        total_records = len(users_db) + len(products_db) + len(orders_db) + len(order_items_db) + len(transactions_db) + len(fact_sales_records)
+        # Pre-extract each dimension into a column tuple keyed by its join
+        # ID: the loop below is then four dict probes plus one tuple
+        # concatenation per item, with no per-row attribute access on the
+        # schema objects. This is the same hash join a DataFrame merge
+        # would run, without pulling in pandas for the seeder.
+        user_map = {
+            u.user_id: (u.user_id, u.name, u.email, u.phone, u.address, u.created_at)
+            for u in users_schema
+        }
+        product_map = {
+            p.product_id: (p.product_id, p.name, p.category, p.price, p.stock, p.rating)
+            for p in products_schema
+        }
+        order_map = {
+            o.order_id: (o.user_id, o.total_amount, o.status, o.created_at)
+            for o in orders_schema
+        }
+        transaction_map = {
+            t.order_id: (t.transaction_id, t.amount, t.payment_method, t.status, t.timestamp)
+            for t in transactions_schema
+        }
+
+        # The maps carry everything the join needs, so the source lists can
+        # be released before the fact build doubles up the data in memory
+        del users_schema, products_schema, orders_schema, transactions_schema
+
+        # Fact rows stream straight into COPY one at a time instead of
+        # materializing a 112k-tuple list first
+        n_facts_inserted = _copy_rows(
+            raw, "fact_sales", FACT_SALES_COLUMNS,
+            _iter_fact_rows(order_items_schema, user_map, product_map, order_map, transaction_map),
+        )
+
+        print("  Rebuilding indexes...")
+        with raw.cursor() as cur:
+            cur.execute("SET session_replication_role = DEFAULT")
+            for index_def in index_defs:
+                cur.execute(index_def)
+
+        # One commit for the whole load: a single WAL flush instead of one
+        # per table, and a failed seed rolls back to an empty database
+        raw.commit()
+        print(f"    ✓ Inserted {n_facts_inserted:,} fact_sales records")
+
+        total_records = n_users_inserted + n_products_inserted + n_orders_inserted + n_order_items_inserted + n_transactions_inserted + n_facts_inserted
         
         print(f"\n{'='*50}")
         print(f"Database seeding completed!")
         print(f"{'='*50}")
-        print(f"  Users:        {len(users_db):,}")
-        print(f"  Products:     {len(products_db):,}")
-        print(f"  Orders:       {len(orders_db):,}")
-        print(f"  Order Items:  {len(order_items_db):,}")
-        print(f"  Transactions: {len(transactions_db):,}")
-        print(f"  Fact Sales:   {len(fact_sales_records):,}")
+        print(f"  Users:        {n_users_inserted:,}")
+        print(f"  Products:     {n_products_inserted:,}")
+        print(f"  Orders:       {n_orders_inserted:,}")
+        print(f"  Order Items:  {n_order_items_inserted:,}")
+        print(f"  Transactions: {n_transactions_inserted:,}")
+        print(f"  Fact Sales:   {n_facts_inserted:,}")
         print(f"{'='*50}")
         print(f"  TOTAL:        {total_records:,} records")
         print(f"{'='*50}")
         
         return {
-            "users": len(users_db),
-            "products": len(products_db),
-            "orders": len(orders_db),
-            "order_items": len(order_items_db),
-            "transactions": len(transactions_db),
-            "fact_sales": len(fact_sales_records),
+            "users": n_users_inserted,
+            "products": n_products_inserted,
+            "orders": n_orders_inserted,
+            "order_items": n_order_items_inserted,
+            "transactions": n_transactions_inserted,
+            "fact_sales": n_facts_inserted,
             "total": total_records
         }
-        
+
     except Exception as e:
-        session.rollback()
+        raw.rollback()
         print(f"Error seeding database: {e}")
         raise
     finally:
-        session.close()
+        raw.close()
 
 
 
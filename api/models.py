@@ -1,15 +1,22 @@
 from sqlalchemy import (
     Column, String, Integer, DECIMAL, ForeignKey,
-    DateTime, Enum, CheckConstraint
+    DateTime, Enum, CheckConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, relationship
 import uuid
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, ConfigDict, Field
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, PlainSerializer
 from decimal import Decimal
 
+# pydantic v2 renders Decimal as a JSON *string* in mode='json', but these
+# fields have always gone over the wire as numbers (the frontend types them
+# as number), so serialize them as floats while keeping Decimal validation
+DecimalNumber = Annotated[
+    Decimal, PlainSerializer(float, return_type=float, when_used='json')
+]
+
 # SQL models
 class Base(DeclarativeBase):
     pass
@@ -104,9 +111,9 @@ class ProductSchema(BaseModel):
     product_id: uuid.UUID = Field(..., description="Unique product identifier")
     name: str = Field(..., description="Product name")
     category: str = Field(..., description="Product category")
-    price: Decimal = Field(...,ge=1, description="Product price")
+    price: DecimalNumber = Field(...,ge=1, description="Product price")
     stock: int = Field(...,ge=1, description="Available stock quantity")
-    rating: Optional[Decimal] = Field(...,ge=0.5, description="Product rating")
+    rating: Optional[DecimalNumber] = Field(...,ge=0.5, description="Product rating")
 
 
 class OrderItemSchema(BaseModel):
@@ -116,7 +123,7 @@ class OrderItemSchema(BaseModel):
     order_id: uuid.UUID = Field(..., description="Associated order identifier")
     product_id: uuid.UUID = Field(..., description="Associated product identifier")
     quantity: int = Field(..., ge=1, description="Quantity ordered")
-    unit_price: Decimal = Field(...,ge=1, description="Price per unit")
+    unit_price: DecimalNumber = Field(...,ge=1, description="Price per unit")
 
 
 class TransactionSchema(BaseModel):
@@ -124,7 +131,7 @@ class TransactionSchema(BaseModel):
     
     transaction_id: uuid.UUID = Field(..., description="Unique transaction identifier")
     order_id: uuid.UUID = Field(..., description="Associated order identifier")
-    amount: Decimal = Field(..., description="Transaction amount")
+    amount: DecimalNumber = Field(..., description="Transaction amount")
     payment_method: str = Field(..., description="Payment method used")
     status: str = Field(..., description="Transaction status")
     timestamp: datetime = Field(..., description="Transaction timestamp")
@@ -135,7 +142,7 @@ class OrderSchema(BaseModel):
     
     order_id: uuid.UUID = Field(..., description="Unique order identifier")
     user_id: uuid.UUID = Field(..., description="Associated user identifier")
-    total_amount: Decimal = Field(..., description="Total order amount")
+    total_amount: DecimalNumber = Field(..., description="Total order amount")
     status: str = Field(..., description="Order status")
     created_at: datetime = Field(..., description="Order creation timestamp")
 
@@ -180,6 +187,29 @@ class FactSales(Base):
     transaction_status = Column(String(50))
     transaction_timestamp = Column(DateTime)
 
+    # Composite indexes matching the hot filter shapes (status/payment
+    # equality plus the period range on the matching timestamp) and trigram
+    # GIN indexes for the ILIKE '%x%' filters, which a plain btree cannot
+    # serve; mirrored in scripts/create_indexes.sql for existing databases
+    # The covering indexes carry the aggregated columns in INCLUDE so the
+    # summary/chart range scans become index-only scans with no heap visits
+    __table_args__ = (
+        Index('idx_fact_sales_order_created_at_desc', order_created_at.desc(), fact_id.desc()),
+        Index('idx_fact_sales_created_covering', order_created_at,
+              postgresql_include=['order_id', 'user_id', 'order_total_amount', 'order_status']),
+        Index('idx_fact_sales_txn_ts_covering', transaction_timestamp,
+              postgresql_include=['transaction_id', 'transaction_payment_method', 'transaction_status']),
+        Index('idx_fact_sales_order_status_created_at', order_status, order_created_at),
+        Index('idx_fact_sales_tx_status_timestamp', transaction_status, transaction_timestamp),
+        Index('idx_fact_sales_payment_method_timestamp', transaction_payment_method, transaction_timestamp),
+        Index('idx_fact_sales_product_name_trgm', product_name,
+              postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'}),
+        Index('idx_fact_sales_product_category_trgm', product_category,
+              postgresql_using='gin', postgresql_ops={'product_category': 'gin_trgm_ops'}),
+        Index('idx_fact_sales_user_email_trgm', user_email,
+              postgresql_using='gin', postgresql_ops={'user_email': 'gin_trgm_ops'}),
+    )
+
 
 class FactSalesSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -198,24 +228,24 @@ class FactSalesSchema(BaseModel):
     product_id: uuid.UUID = Field(..., description="Product identifier")
     product_name: str = Field(..., description="Product name")
     product_category: str = Field(..., description="Product category")
-    product_price: Decimal = Field(..., description="Product price")
+    product_price: DecimalNumber = Field(..., description="Product price")
     product_stock: int = Field(..., description="Product stock")
-    product_rating: Optional[Decimal] = Field(None, description="Product rating")
+    product_rating: Optional[DecimalNumber] = Field(None, description="Product rating")
     
     # Order dimension
     order_id: uuid.UUID = Field(..., description="Order identifier")
-    order_total_amount: Decimal = Field(..., description="Order total amount")
+    order_total_amount: DecimalNumber = Field(..., description="Order total amount")
     order_status: str = Field(..., description="Order status")
     order_created_at: datetime = Field(..., description="Order creation timestamp")
     
     # Order Item dimension
     order_item_id: uuid.UUID = Field(..., description="Order item identifier")
     order_item_quantity: int = Field(..., description="Order item quantity")
-    order_item_unit_price: Decimal = Field(..., description="Order item unit price")
+    order_item_unit_price: DecimalNumber = Field(..., description="Order item unit price")
     
     # Transaction dimension
     transaction_id: uuid.UUID = Field(..., description="Transaction identifier")
-    transaction_amount: Decimal = Field(..., description="Transaction amount")
+    transaction_amount: DecimalNumber = Field(..., description="Transaction amount")
     transaction_payment_method: str = Field(..., description="Payment method")
     transaction_status: str = Field(..., description="Transaction status")
     transaction_timestamp: datetime = Field(..., description="Transaction timestamp")
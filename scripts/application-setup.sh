@@ -1,7 +1,7 @@
 cd ..
 
 # Open uvicorn in a new terminal
-osascript -e 'tell app "Terminal" to do script "cd \"'"$(pwd)"'\" && source venv/bin/activate && cd api && uvicorn main:app"'
+osascript -e 'tell app "Terminal" to do script "cd \"'"$(pwd)"'\" && source venv/bin/activate && uvicorn api.main:app"'
 
 # Open npm in a new terminal
 osascript -e 'tell app "Terminal" to do script "cd \"'"$(pwd)"'\" && npm run dev"'
\ No newline at end of file
@@ -8,6 +8,29 @@ CREATE INDEX IF NOT EXISTS idx_fact_sales_payment_method ON fact_sales(transacti
 CREATE INDEX IF NOT EXISTS idx_fact_sales_transaction_timestamp ON fact_sales(transaction_timestamp);
 CREATE INDEX IF NOT EXISTS idx_fact_sales_user_id ON fact_sales(user_id);
 
+-- Composite indexes matching the hot filter shapes: status/payment equality
+-- plus the period range on the matching timestamp column
+CREATE INDEX IF NOT EXISTS idx_fact_sales_order_created_at_desc ON fact_sales(order_created_at DESC, fact_id DESC);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_order_status_created_at ON fact_sales(order_status, order_created_at);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_tx_status_timestamp ON fact_sales(transaction_status, transaction_timestamp);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_payment_method_timestamp ON fact_sales(transaction_payment_method, transaction_timestamp);
+
+-- Covering indexes: the INCLUDE columns let the summary/chart range scans
+-- run as index-only scans over the date slice instead of heap scans
+CREATE INDEX IF NOT EXISTS idx_fact_sales_created_covering
+  ON fact_sales (order_created_at)
+  INCLUDE (order_id, user_id, order_total_amount, order_status);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_txn_ts_covering
+  ON fact_sales (transaction_timestamp)
+  INCLUDE (transaction_id, transaction_payment_method, transaction_status);
+
+-- Trigram GIN indexes so the ILIKE '%x%' filters can use an index scan
+-- (a plain btree cannot serve a leading-wildcard pattern)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_fact_sales_product_name_trgm ON fact_sales USING gin (product_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_product_category_trgm ON fact_sales USING gin (product_category gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_fact_sales_user_email_trgm ON fact_sales USING gin (user_email gin_trgm_ops);
+
 -- Verify indexes were created
 SELECT schemaname, tablename, indexname 
 FROM pg_indexes 
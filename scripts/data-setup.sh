@@ -1,4 +1,4 @@
 cd ..
-python api/mockdata.py
+python -m api.mockdata
 
 psql -d mirtech -f create_indexes.sql
\ No newline at end of file